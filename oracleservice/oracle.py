@@ -10,7 +10,7 @@ from service_parameters import ServiceParameters
 from substrateinterface import Keypair
 from substrateinterface.exceptions import BlockNotFound
 from typing import Any
-from utils import cache, create_interface, create_provider, EXPECTED_NETWORK_EXCEPTIONS
+from utils import cache, create_interface, create_provider, EXPECTED_NETWORK_EXCEPTIONS, is_expected_network_exception
 
 
 TX_SUCCESS = 1
@@ -28,7 +28,9 @@ class Oracle:
     era_delay_time_start: float = 0.
     failure_reqs_count: dict = field(default_factory=dict)
     last_era_reported: dict = field(default_factory=dict)
+    next_nonce: int = None
     previous_active_era_id: int = -1
+    stash_keypairs: dict = field(default_factory=dict)
     time_of_era_immutability: float = 0.
     undesirable_urls: set = field(default_factory=set)
     was_recovered: bool = False
@@ -106,6 +108,8 @@ class Oracle:
             cache.set('oracle_status', 'recovering')
         metrics_exporter.is_recovery_mode_active.set(True)
         self.default_mode_started = False
+        # The pending transaction may have been lost, so the nonce is requested from the node again
+        self.next_nonce = None
 
         self.was_recovered = True
         self._recover_connection_to_relay_chain()
@@ -171,14 +175,12 @@ class Oracle:
                         type_registry_preset=self.service_params.type_registry_preset,
                         timeout=self.service_params.timeout,
                         undesirable_urls=self.undesirable_urls,
-                        substrate=self.service_params.substrate,
                     )
                 metrics_exporter.agent.info({'relay_chain_node_address': self.service_params.substrate.url})
                 break
 
             except Exception as exc:
-                exc_type = type(exc)
-                if exc_type in EXPECTED_NETWORK_EXCEPTIONS:
+                if is_expected_network_exception(exc):
                     logger.warning(f"{type(exc)}: {exc}")
                 else:
                     logger.error(f"{type(exc)}: {exc}")
@@ -209,8 +211,7 @@ class Oracle:
                 else:
                     self.failure_reqs_count[self.service_params.w3.provider.endpoint_uri] = 1
             except Exception as exc:
-                exc_type = type(exc)
-                if exc_type in EXPECTED_NETWORK_EXCEPTIONS:
+                if is_expected_network_exception(exc):
                     logger.warning(f"{type(exc)}: {exc}")
                 else:
                     logger.error(f"{type(exc)}: {exc}")
@@ -233,7 +234,7 @@ class Oracle:
                 logger.error(f"Failed to call the isReportedLastEra method from the OracleMaster contract: {exc}")
                 raise exc
 
-            stash = Keypair(public_key=stash_acc, ss58_format=self.service_params.ss58_format)
+            stash = self._get_stash_keypair(stash_acc)
             self.last_era_reported[stash.public_key] = era_id if is_reported else era_id - 1
 
     def _wait_in_two_blocks(self, tx_receipt: dict):
@@ -325,7 +326,7 @@ class Oracle:
         for stash_acc in stash_accounts:
             self.failure_reqs_count[self.service_params.substrate.url] += 1
 
-            stash = Keypair(public_key=stash_acc, ss58_format=self.service_params.ss58_format)
+            stash = self._get_stash_keypair(stash_acc)
 
             if self.last_era_reported.get(stash.public_key, 0) >= active_era_id - 1:
                 logger.info(f"The report has already been sent for stash {stash.ss58_address}")
@@ -334,16 +335,17 @@ class Oracle:
             staking_parameters = self.report_parameters_reader.get_stash_staking_parameters(stash, block_hash)
             self.failure_reqs_count[self.service_params.substrate.url] -= 1
 
-            logger.info('; '.join([
-                "The parameters are read. Preparing the transaction body",
-                f"stash: {stash.ss58_address}",
-                f"era: {active_era_id - 1}",
-                f"staking parameters: {staking_parameters}",
-            ]))
-            logger.debug('; '.join([
-                f"Relay chain failure requests counter: {self.failure_reqs_count[self.service_params.substrate.url]}",
-                f"Parachain failure requests counter: {self.failure_reqs_count[self.service_params.w3.provider.endpoint_uri]}",
-            ]))
+            logger.info(
+                "The parameters are read. Preparing the transaction body; stash: %s; era: %s; staking parameters: %s",
+                stash.ss58_address,
+                active_era_id - 1,
+                staking_parameters,
+            )
+            logger.debug(
+                "Relay chain failure requests counter: %s; Parachain failure requests counter: %s",
+                self.failure_reqs_count[self.service_params.substrate.url],
+                self.failure_reqs_count[self.service_params.w3.provider.endpoint_uri],
+            )
 
             with metrics_exporter.para_exceptions_count.count_exceptions():
                 tx = self._create_tx(active_era_id - 1, staking_parameters)
@@ -363,6 +365,15 @@ class Oracle:
         if self.service_params.w3.provider.endpoint_uri in self.undesirable_urls:
             self.undesirable_urls.remove(self.service_params.w3.provider.endpoint_uri)
 
+    def _get_stash_keypair(self, stash_acc: bytes) -> Keypair:
+        """Get a keypair of the stash account, so that its ss58 address is encoded only once"""
+        stash = self.stash_keypairs.get(stash_acc)
+        if stash is None:
+            stash = Keypair(public_key=stash_acc, ss58_format=self.service_params.ss58_format)
+            self.stash_keypairs[stash_acc] = stash
+
+        return stash
+
     def _get_stash_accounts(self) -> tuple:
         """Get stash accounts from the OracleMaster contract"""
         self.failure_reqs_count[self.service_params.substrate.url] += 1
@@ -431,14 +442,16 @@ class Oracle:
 
     def _create_tx(self, era_id: int, staking_parameters: dict) -> dict:
         """Create a transaction body using the staking parameters, era id and parachain balance"""
-        try:
-            nonce = self.service_params.w3.eth.get_transaction_count(self.service_params.account.address)
-        except EXPECTED_NETWORK_EXCEPTIONS as exc:
-            logger.warning(f"Failed to get the transaction count: {exc}")
-            raise exc
-        except Exception as exc:
-            logger.error(f"Failed to get the transaction count: {exc}")
-            raise exc
+        nonce = self.next_nonce
+        if nonce is None:
+            try:
+                nonce = self.service_params.w3.eth.get_transaction_count(self.service_params.account.address)
+            except EXPECTED_NETWORK_EXCEPTIONS as exc:
+                logger.warning(f"Failed to get the transaction count: {exc}")
+                raise exc
+            except Exception as exc:
+                logger.error(f"Failed to get the transaction count: {exc}")
+                raise exc
 
         try:
             transaction = self.oracle_master_contract.functions.reportRelay(
@@ -483,8 +496,10 @@ class Oracle:
         tx_hash = self.service_params.w3.eth.send_raw_transaction(tx_signed.rawTransaction)
         logger.info(f"Transaction hash: {tx_hash.hex()}")
         tx_receipt = self.service_params.w3.eth.wait_for_transaction_receipt(tx_hash)
+        # The transaction is included in a block, so its nonce is used regardless of the status
+        self.next_nonce = tx['nonce'] + 1
 
-        logger.debug(f"Transaction receipt: {tx_receipt}")
+        logger.debug("Transaction receipt: %s", tx_receipt)
 
         if tx_receipt.status == TX_SUCCESS:
             logger.info(f"The report for stash '{stash.ss58_address}' era {era_id} was sent successfully")
@@ -1,7 +1,8 @@
 import logging
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from prometheus_metrics import metrics_exporter
+from scalecodec.base import ScaleBytes, ScaleType
 from service_parameters import ServiceParameters
 from substrateinterface import Keypair
 from typing import Union
@@ -10,17 +11,36 @@ from utils import EXPECTED_NETWORK_EXCEPTIONS
 
 logger = logging.getLogger(__name__)
 
+STASH_STORAGE_FUNCTIONS = (
+    ('System', 'Account'),
+    ('Staking', 'Bonded'),
+    ('Staking', 'Nominators'),
+)
+CONTROLLER_STORAGE_FUNCTIONS = (
+    ('Staking', 'Ledger'),
+    ('Staking', 'SlashingSpans'),
+)
+
 
 @dataclass
 class ReportParametersReader:
     """A class that contains all the logic of reading data for the Oracle report"""
     service_params: ServiceParameters
 
+    controller_keypairs: dict = field(default_factory=dict)
+    prefetched_values: dict = field(default_factory=dict)
+    storage_keys: dict = field(default_factory=dict)
+    validators: frozenset = frozenset()
+    validators_block_hash: str = None
+
     def get_stash_staking_parameters(self, stash: Keypair, block_hash: str) -> dict:
         """Get staking parameters for specific stash from specific block or from the head"""
         logger.info(f"Reading staking parameters for stash {stash.ss58_address}")
+        # Drop the values left unread by the previous stash, e.g. when reading it has failed
+        self.prefetched_values.clear()
 
         with metrics_exporter.relay_exceptions_count.count_exceptions():
+            self._prefetch_by_account(STASH_STORAGE_FUNCTIONS, stash, block_hash)
             stash_free_balance = self._get_stash_free_balance(stash, block_hash)
             stake_status = self._get_stake_status(stash, block_hash)
             staking_ledger_result = self._get_ledger_data(block_hash, stash)
@@ -55,10 +75,10 @@ class ReportParametersReader:
     def _get_ledger_data(self, block_hash: str, stash: Keypair) -> Union[dict, None]:
         """Get ledger data using stash account address"""
         try:
-            controller = self.service_params.substrate.query(
+            controller = self._query_by_account(
                 module='Staking',
                 storage_function='Bonded',
-                params=[stash.ss58_address],
+                account=stash,
                 block_hash=block_hash,
             )
         except EXPECTED_NETWORK_EXCEPTIONS as exc:
@@ -70,13 +90,14 @@ class ReportParametersReader:
         if controller.value is None:
             return None
 
-        controller = Keypair(ss58_address=controller.value)
+        controller = self._get_controller_keypair(controller.value)
+        self._prefetch_by_account(CONTROLLER_STORAGE_FUNCTIONS, controller, block_hash)
 
         try:
-            ledger = self.service_params.substrate.query(
+            ledger = self._query_by_account(
                 module='Staking',
                 storage_function='Ledger',
-                params=[controller.ss58_address],
+                account=controller,
                 block_hash=block_hash,
             )
         except EXPECTED_NETWORK_EXCEPTIONS as exc:
@@ -90,10 +111,10 @@ class ReportParametersReader:
         result.update(ledger.value)
 
         try:
-            slashing_spans = self.service_params.substrate.query(
+            slashing_spans = self._query_by_account(
                 module='Staking',
                 storage_function='SlashingSpans',
-                params=[controller.ss58_address],
+                account=controller,
                 block_hash=block_hash,
             )
         except EXPECTED_NETWORK_EXCEPTIONS as exc:
@@ -102,17 +123,27 @@ class ReportParametersReader:
         except Exception as exc:
             logger.error(f"Failed to get the slashing spans  {controller.ss58_address}: {exc}")
             raise exc
-        result['slashingSpans_number'] = 0 if slashing_spans.value is None else len(slashing_spans.value['prior'])
+        slashing_spans = slashing_spans.value
+        result['slashingSpans_number'] = 0 if slashing_spans is None else len(slashing_spans['prior'])
 
         return result
 
+    def _get_controller_keypair(self, controller_address: str) -> Keypair:
+        """Get a keypair of the controller account, so that its ss58 address is decoded only once"""
+        controller = self.controller_keypairs.get(controller_address)
+        if controller is None:
+            controller = Keypair(ss58_address=controller_address)
+            self.controller_keypairs[controller_address] = controller
+
+        return controller
+
     def _get_stash_free_balance(self, stash: Keypair, block_hash: str) -> int:
         """Get stash accounts free balances"""
         try:
-            account_info = self.service_params.substrate.query(
+            account_info = self._query_by_account(
                 module='System',
                 storage_function='Account',
-                params=[stash.ss58_address],
+                account=stash,
                 block_hash=block_hash,
             )
         except EXPECTED_NETWORK_EXCEPTIONS as exc:
@@ -121,29 +152,40 @@ class ReportParametersReader:
         except Exception as exc:
             logger.error(f"Failed to get the account {stash.ss58_address} info: {exc}")
             raise exc
-        metrics_exporter.total_stashes_free_balance.inc(account_info.value['data']['free'])
+        free_balance = account_info.value['data']['free']
+        metrics_exporter.total_stashes_free_balance.inc(free_balance)
 
-        return account_info.value['data']['free']
+        return free_balance
 
     def _get_stake_status(self, stash: Keypair, block_hash: str) -> int:
         """Get a status of a stash account. 0 - Idle, 1 - Nominator, 2 - Validator"""
         try:
-            staking_nominators = self.service_params.substrate.query_map(
+            nominations = self._query_by_account(
                 module='Staking',
                 storage_function='Nominators',
+                account=stash,
                 block_hash=block_hash,
             )
         except EXPECTED_NETWORK_EXCEPTIONS as exc:
-            logger.warning(f"Failed to get nominators: {exc}")
+            logger.warning(f"Failed to get the nominations {stash.ss58_address}: {exc}")
             raise exc
         except Exception as exc:
-            logger.error(f"Failed to get nominators: {exc}")
+            logger.error(f"Failed to get the nominations {stash.ss58_address}: {exc}")
             raise exc
 
-        nominators = set(nominator.value for nominator, _ in staking_nominators)
-        if stash.ss58_address in nominators:
+        if nominations.value is not None:
             return 1
 
+        if stash.ss58_address in self._get_validators(block_hash):
+            return 2
+
+        return 0
+
+    def _get_validators(self, block_hash: str) -> frozenset:
+        """Get the session validators. All stashes of an era are read from the same block, so it is cached"""
+        if block_hash is not None and self.validators_block_hash == block_hash:
+            return self.validators
+
         try:
             staking_validators = self.service_params.substrate.query(
                 module='Session',
@@ -157,8 +199,89 @@ class ReportParametersReader:
             logger.error(f"Failed to get validators: {exc}")
             raise exc
 
-        validators = set(validator for validator in staking_validators.value)
-        if stash.ss58_address in validators:
-            return 2
+        self.validators = frozenset(staking_validators.value)
+        self.validators_block_hash = block_hash
 
-        return 0
+        return self.validators
+
+    def _prefetch_by_account(self, storage_functions: tuple, account: Keypair, block_hash: str):
+        """Read several storage entries keyed by the account with a single request"""
+        storage_keys = [
+            self._get_storage_key(module, storage_function, account, block_hash)
+            for module, storage_function in storage_functions
+        ]
+        try:
+            response = self.service_params.substrate.rpc_request(
+                'state_queryStorageAt',
+                [storage_keys, block_hash],
+            )
+        except EXPECTED_NETWORK_EXCEPTIONS as exc:
+            logger.warning(f"Failed to read the storage of {account.ss58_address}: {exc}")
+            raise exc
+        except Exception as exc:
+            logger.error(f"Failed to read the storage of {account.ss58_address}: {exc}")
+            raise exc
+
+        changes = {}
+        for change_set in response['result']:
+            changes.update(change_set['changes'])
+
+        for (module, storage_function), storage_key in zip(storage_functions, storage_keys):
+            self.prefetched_values[(block_hash, storage_key)] = self._decode_storage_value(
+                module,
+                storage_function,
+                changes.get(storage_key),
+                block_hash,
+            )
+
+    def _decode_storage_value(self, module: str, storage_function: str, data: str, block_hash: str) -> ScaleType:
+        """Decode the raw storage value the same way SubstrateInterface.query does"""
+        substrate = self.service_params.substrate
+        storage_item = substrate.get_metadata_storage_function(module, storage_function, block_hash=block_hash)
+        value_scale_type = storage_item.get_value_type_string()
+        if data is None:
+            # Fallback to the default value of the storage function, otherwise it is an empty Option<...>
+            data = storage_item.value_object['default'].value_object
+            if storage_item.value['modifier'] != 'Default':
+                value_scale_type = f'Option<{value_scale_type}>'
+
+        value = substrate.runtime_config.create_scale_object(
+            type_string=value_scale_type,
+            data=ScaleBytes(data),
+            metadata=substrate.metadata,
+        )
+        value.decode()
+
+        return value
+
+    def _get_storage_key(self, module: str, storage_function: str, account: Keypair, block_hash: str) -> str:
+        """Get the storage key of the entry keyed by the account, computing it only once"""
+        key = (module, storage_function, account.public_key)
+        storage_key = self.storage_keys.get(key)
+        if storage_key is None:
+            substrate = self.service_params.substrate
+            metadata_module = substrate.get_metadata_module(module, block_hash=block_hash)
+            storage_item = substrate.get_metadata_storage_function(module, storage_function, block_hash=block_hash)
+            storage_key = substrate.generate_storage_hash(
+                storage_module=metadata_module.value['storage']['prefix'],
+                storage_function=storage_function,
+                params=[account.public_key.hex()],
+                hashers=storage_item.get_param_hashers(),
+            )
+            self.storage_keys[key] = storage_key
+
+        return storage_key
+
+    def _query_by_account(self, module: str, storage_function: str, account: Keypair, block_hash: str) -> ScaleType:
+        """Query the storage entry keyed by the account, using the prefetched value if there is one"""
+        storage_key = self._get_storage_key(module, storage_function, account, block_hash)
+        value = self.prefetched_values.pop((block_hash, storage_key), None)
+        if value is not None:
+            return value
+
+        return self.service_params.substrate.query(
+            module=module,
+            storage_function=storage_function,
+            block_hash=block_hash,
+            raw_storage_key=bytes.fromhex(storage_key[2:]),
+        )
@@ -49,6 +49,7 @@ class ServiceParameters:
     max_number_of_failure_requests: int
     oracle_status_lock: Lock
     timeout: int
+    verify_abi_onchain: bool
     waiting_time_before_shutdown: int
 
     rest_api_ip_address: str
@@ -56,8 +57,8 @@ class ServiceParameters:
 
     ss58_format: int
     type_registry_preset: str
-    ws_urls_relay: list
-    ws_urls_para: list
+    ws_urls_relay: tuple
+    ws_urls_para: tuple
 
     substrate: SubstrateInterface
     w3: Web3
@@ -72,10 +73,10 @@ class ServiceParameters:
         assert self.rest_api_port > 0, "The 'REST_API_SERVER_PORT' parameter must be non-negative integer"
 
         logger.info("Checking URLs")
-        self.ws_urls_relay = os.getenv('WS_URL_RELAY').split(',')
+        self.ws_urls_relay = tuple(os.getenv('WS_URL_RELAY').split(','))
         assert not utils.is_invalid_urls(self.ws_urls_relay), "Invalid urls were found in the 'WS_URL_RELAY' parameter"
 
-        self.ws_urls_para = os.getenv('WS_URL_PARA').split(',')
+        self.ws_urls_para = tuple(os.getenv('WS_URL_PARA').split(','))
         assert not utils.is_invalid_urls(self.ws_urls_para), "Invalid urls were found in the 'WS_URL_PARA' parameter"
         logger.info("URLs checked")
 
@@ -130,6 +131,8 @@ class ServiceParameters:
         if self.debug_mode:
             logger.info("Oracle is running in debug mode")
 
+        self.verify_abi_onchain = True if os.getenv('VERIFY_ABI_ONCHAIN') == '1' else False
+
         logger.info("Creating a Web3 object")
         self.w3 = self._create_provider_forcibly(self.ws_urls_para)
         logger.info("Creating a SubstrateInterface object")
@@ -139,7 +142,7 @@ class ServiceParameters:
         oracle_private_key = utils.get_private_key(oracle_private_key_path, os.getenv('ORACLE_PRIVATE_KEY'))
         assert oracle_private_key, "Failed to parse private key"
         # Check private key. Throws an exception if the length is not 32 bytes
-        self.w3.eth.account.from_key(oracle_private_key)
+        self.account = self.w3.eth.account.from_key(oracle_private_key)
 
         logger.info("Checking the contract address")
         contract_address = os.getenv('CONTRACT_ADDRESS')
@@ -148,23 +151,24 @@ class ServiceParameters:
         utils.check_contract_address(self.w3, self.contract_address)
         logger.info("The contract address is checked")
 
-        self.account = self.w3.eth.account.from_key(oracle_private_key)
         logger.info("Checking the ABI")
         self.abi = utils.get_abi(abi_path)
-        utils.check_abi(self.w3, self.contract_address, self.abi)
+        if self.verify_abi_onchain:
+            utils.check_abi(self.abi, self.w3, self.contract_address)
+        else:
+            utils.check_abi(self.abi)
         logger.info("The ABI is checked")
 
         logger.info("Successfully checked configuration parameters")
 
-    def _create_provider_forcibly(self, ws_urls: list) -> Web3:
+    def _create_provider_forcibly(self, ws_urls: tuple) -> Web3:
         """Force attempt to create a Web3 object"""
         for _ in range(0, MAX_ATTEMPTS_TO_RECONNECT):
             try:
                 w3 = utils.create_provider(ws_urls, self.timeout)
 
             except Exception as exc:
-                exc_type = type(exc)
-                if exc_type in utils.EXPECTED_NETWORK_EXCEPTIONS:
+                if utils.is_expected_network_exception(exc):
                     logger.warning(f"Error: {exc}")
                 else:
                     logger.error(f"Error: {exc}")
@@ -174,7 +178,7 @@ class ServiceParameters:
 
         sys.exit("Failed to create a Web3 object")
 
-    def _create_interface_forcibly(self, ws_urls: list) -> SubstrateInterface:
+    def _create_interface_forcibly(self, ws_urls: tuple) -> SubstrateInterface:
         """Force attempt to create a SubstrateInterface object"""
         for _ in range(0, MAX_ATTEMPTS_TO_RECONNECT):
             try:
@@ -186,8 +190,7 @@ class ServiceParameters:
                 )
 
             except Exception as exc:
-                exc_type = type(exc)
-                if exc_type in utils.EXPECTED_NETWORK_EXCEPTIONS:
+                if utils.is_expected_network_exception(exc):
                     logger.warning(f"Error: {exc}")
                 else:
                     logger.error(f"Error: {exc}")
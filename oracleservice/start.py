@@ -12,7 +12,7 @@ from prometheus_client import make_wsgi_app
 from server_thread import ServerThread
 from service_parameters import ServiceParameters
 from threading import Lock
-from utils import cache, check_log_level, EXPECTED_NETWORK_EXCEPTIONS, stop_signal_handler
+from utils import cache, check_log_level, is_expected_network_exception, stop_signal_handler
 from websocket._exceptions import WebSocketConnectionClosedException
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
 
@@ -58,12 +58,10 @@ def main():
 
     signal.signal(signal.SIGTERM, partial(
         stop_signal_handler,
-        substrate=oracle.service_params.substrate,
         rest_api_server=rest_api_server,
     ))
     signal.signal(signal.SIGINT, partial(
         stop_signal_handler,
-        substrate=oracle.service_params.substrate,
         rest_api_server=rest_api_server,
     ))
 
@@ -78,16 +76,13 @@ def oracle_loop_start(oracle: Oracle, rest_api_server: ServerThread):
 
         except Exception as exc:
             exc_type = type(exc)
-            if exc_type in EXPECTED_NETWORK_EXCEPTIONS:
+            if is_expected_network_exception(exc):
                 logger.warning(f"{exc_type}: {exc}")
             else:
                 logger.error(f"{exc_type}: {exc}")
                 if exc_type == WebSocketConnectionClosedException:
                     if exc.args and exc.args[0] == 'socket is already closed.':
-                        stop_signal_handler(
-                            substrate=oracle.service_params.substrate,
-                            rest_api_server=rest_api_server,
-                        )
+                        stop_signal_handler(rest_api_server=rest_api_server)
             oracle.start_recovery_mode()
 
 
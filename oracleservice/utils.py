@@ -1,23 +1,34 @@
 import asyncio
-import json
+import functools
+import itertools
 import logging
+import os
+import random
+import re
 import socket
-import sys
+import struct
+import threading
 import time
-import urllib
 
 from eth_typing import ChecksumAddress
+from eth_utils import function_abi_to_4byte_selector
 from flask_caching import Cache
 from os.path import exists
 from server_thread import ServerThread
 from socket import gaierror
 from substrateinterface import SubstrateInterface
 from substrateinterface.exceptions import BlockNotFound, SubstrateRequestException
+from typing import Any, Callable, Union
 from web3 import Web3
 from web3.exceptions import ABIFunctionNotFound, BadFunctionCallOutput, TimeExhausted, ValidationError
 from websocket._exceptions import WebSocketAddressException, WebSocketConnectionClosedException
 from websockets.exceptions import ConnectionClosedError, InvalidMessage, InvalidStatusCode
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 logger = logging.getLogger(__name__)
 
@@ -52,149 +63,269 @@ EXPECTED_NETWORK_EXCEPTIONS = (
     WebSocketAddressException,
     WebSocketConnectionClosedException,
 )
+EXPECTED_NETWORK_EXCEPTION_TYPES = frozenset(EXPECTED_NETWORK_EXCEPTIONS)
+
+UNSUPPORTED_TYPE_REGISTRY_PRESET = "Unsupported type registry preset"
+
+DEFAULT_PORTS = {
+    'ws': 80,
+    'wss': 443,
+}
+REACHABILITY_TIMEOUT = 2
+
+# ws:// or wss:// url with a host and an optional port, path and query, but without a non-empty fragment
+WS_URL_PATTERN = re.compile(
+    r'^(?P<scheme>(?i:wss?))://'
+    r'(?:[^@/?#\s]*@)?'
+    r'(?P<host>\[[0-9A-Fa-f:.]+\]|[^:/?#;@\s\[\]]+)'
+    r'(?::(?P<port>\d*))?'
+    r'(?:/[^?#\s]*)?'
+    r'(?:\?[^#\s]*)?#?$'
+)
+
+BACKOFF_BASE_DELAY = 0.2
+REST_API_SERVER_SHUTDOWN_TIMEOUT = 5
 
 
 cache = Cache()
+substrate_pool = {}
 
 
 def stop_signal_handler(
         sig: int = None, frame=None,
-        substrate: SubstrateInterface = None,
         rest_api_server: ServerThread = None,
 ):
-    """Handle signal, close substrate interface websocket connection and terminate the process"""
-    logger.debug(f"Receiving signal: {sig}")
-    if substrate is not None:
-        logger.debug("Closing the SubstrateInterface websocket connection")
+    """Handle signal, close substrate interface websocket connections and terminate the process"""
+    logger.debug("Receiving signal: %s", sig)
+    logger.debug("Closing the SubstrateInterface websocket connections")
+    drain_pool()
+
+    if rest_api_server is not None:
+        logger.info("Shutting down the REST API server")
+        try:
+            shutdown_thread = threading.Thread(target=rest_api_server.shutdown, daemon=True)
+            shutdown_thread.start()
+            shutdown_thread.join(REST_API_SERVER_SHUTDOWN_TIMEOUT)
+        except Exception as exc:
+            logger.warning(exc)
+
+    # Skip the interpreter finalizers that may stall on the open websocket connections
+    logging.shutdown()
+    os._exit(0)
+
+
+def abort_connection(sock: Union[socket.socket, None]) -> bool:
+    """
+    Close the socket with RST instead of FIN, so that closing does not wait for an unresponsive peer.
+    Return False if there was nothing to close: no socket or an already closed one.
+    """
+    if sock is None or sock.fileno() == -1:
+        return False
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    sock.close()
+
+    return True
+
+
+def is_expected_network_exception(exc: Exception) -> bool:
+    """Check if the exception is an instance of one of the expected network exceptions"""
+    return any(exc_type in EXPECTED_NETWORK_EXCEPTION_TYPES for exc_type in type(exc).__mro__)
+
+
+def drain_pool():
+    """Close the websocket connections of all pooled SubstrateInterface objects"""
+    for substrate in substrate_pool.values():
         try:
-            substrate.websocket.sock.shutdown(socket.SHUT_RDWR)
+            # The connections shut down by the recovery mode have nothing to close
+            is_closed = abort_connection(substrate.websocket.sock)
         except (
             AttributeError,
             OSError,
         ) as exc:
             logger.warning(exc)
         else:
-            logger.debug(f"Connection to the relay chain node {substrate.url} is closed")
+            if is_closed:
+                logger.debug("Connection to the relay chain node %s is closed", substrate.url)
+    substrate_pool.clear()
 
-    if rest_api_server is not None:
-        logger.info("Shutting down the REST API server")
-        try:
-            rest_api_server.shutdown()
-        except Exception as exc:
-            logger.warning(exc)
 
-    sys.exit()
+def get_next_backoff(previous_delay: float, base: float = BACKOFF_BASE_DELAY, cap: float = 60) -> float:
+    """Get the next delay between reconnection attempts using the decorrelated jitter"""
+    return min(cap, random.uniform(base, previous_delay * 3))
 
 
-def create_provider(urls: list, timeout: int = 60, undesirable_urls: set or list = None) -> Web3:
-    """Create web3 websocket provider with one of the nodes given in the list"""
-    if undesirable_urls is None:
-        undesirable_urls = set()
-    tried_all = False
+def split_urls(urls: tuple, undesirable_urls: frozenset) -> (list, list):
+    """Split the urls into the preferred ones and the undesirable ones to fall back on"""
+    preferred_urls = [url for url in urls if url not in undesirable_urls]
+    fallback_urls = [url for url in urls if url in undesirable_urls]
+    if fallback_urls:
+        logger.info("Undesirable urls will be tried last: %s", fallback_urls)
+
+    return preferred_urls, fallback_urls
+
+
+def connect_to_any_node(
+        connect: Callable[[str], Any], tag: str,
+        urls: tuple, timeout: int = 60,
+        undesirable_urls: frozenset = frozenset(),
+        max_retries: int = None,
+) -> Any:
+    """
+    Try to connect to the nodes one by one, the undesirable ones last, until the connection succeeds.
+    Rounds over the urls are separated by an exponentially growing delay capped by the timeout.
+    """
+    preferred_urls, fallback_urls = split_urls(urls, undesirable_urls)
+    delay = BACKOFF_BASE_DELAY
+    retries = 0
 
     while True:
-        for url in urls:
-            if url in undesirable_urls and not tried_all:
-                logger.info(f"Skipping undesirable url: {url}")
-                continue
+        for url in itertools.chain(preferred_urls, fallback_urls):
+            connection = connect(url)
+            if connection is not None:
+                return connection
+
+        logger.error("[%s] Failed to connect to any node", tag)
+        retries += 1
+        if max_retries is not None and retries >= max_retries:
+            raise ConnectionError(f"[{tag}] Failed to connect to any node after {retries} retries")
+
+        delay = get_next_backoff(delay, cap=timeout)
+        logger.info("Timeout: %.1f seconds", delay)
+        time.sleep(delay)
+
+
+def create_provider(
+        urls: tuple, timeout: int = 60,
+        undesirable_urls: frozenset = frozenset(),
+        max_retries: int = None,
+) -> Web3:
+    """Create web3 websocket provider with one of the nodes given in the list"""
+    return connect_to_any_node(_connect_provider, 'web3py', urls, timeout, undesirable_urls, max_retries)
+
 
-            try:
-                provider = Web3.WebsocketProvider(url)
-                w3 = Web3(provider)
-                if not w3.is_connected():
-                    raise ConnectionRefusedError
+def _connect_provider(url: str) -> Union[Web3, None]:
+    """Create web3 websocket provider with the node, or return None if the node is not available"""
+    if not is_reachable(url):
+        logger.warning("[web3py] Failed to connect to %s: node is unreachable", url)
+        return None
 
-            except (
-                ValueError,
-                WebSocketAddressException,
-            ) as exc:
-                logger.warning(f"[web3py] Failed to connect to {url}: {exc}")
+    try:
+        provider = Web3.WebsocketProvider(url)
+        w3 = Web3(provider)
+        if not w3.is_connected():
+            raise ConnectionRefusedError
 
-            except ConnectionRefusedError:
-                logger.warning(f"[web3py] Failed to connect to {url}: provider is not connected")
+    except (
+        ValueError,
+        WebSocketAddressException,
+    ) as exc:
+        logger.warning("[web3py] Failed to connect to %s: %s", url, exc)
 
-            else:
-                logger.info(f"[web3py] Successfully connected to {url}")
-                return w3
+    except ConnectionRefusedError:
+        logger.warning("[web3py] Failed to connect to %s: provider is not connected", url)
 
-        tried_all = True
+    else:
+        logger.info("[web3py] Successfully connected to %s", url)
+        return w3
 
-        logger.error("[web3py] Failed to connect to any node")
-        logger.info(f"Timeout: {timeout} seconds")
-        time.sleep(timeout)
+    return None
 
 
 def create_interface(
-        urls: list, ss58_format: int = 2,
+        urls: tuple, ss58_format: int = 2,
         type_registry_preset: str = 'kusama',
-        timeout: int = 60, undesirable_urls=None,
-        substrate: SubstrateInterface = None,
+        timeout: int = 60, undesirable_urls: frozenset = frozenset(),
+        max_retries: int = None,
 ) -> SubstrateInterface:
-    """Create Substrate interface with the first node that comes along, if there is no undesirable one"""
-    if undesirable_urls is None:
-        undesirable_urls = set()
-    recovering = False if substrate is None else True
-    tried_all = False
+    """
+    Create Substrate interface with the first node that comes along, if there is no undesirable one.
+    The interfaces are pooled by node, so reconnecting to a known node reuses its metadata and type registry.
+    """
+    connect = functools.partial(
+        _connect_interface,
+        ss58_format=ss58_format,
+        type_registry_preset=type_registry_preset,
+    )
+
+    return connect_to_any_node(connect, 'substrateinterface', urls, timeout, undesirable_urls, max_retries)
+
+
+def _connect_interface(url: str, ss58_format: int, type_registry_preset: str) -> Union[SubstrateInterface, None]:
+    """Create Substrate interface with the node or take it from the pool, return None if the node is not available"""
+    pool_key = (url, ss58_format, type_registry_preset)
+    try:
+        substrate = substrate_pool.get(pool_key)
+        if substrate is not None:
+            substrate.websocket.shutdown()
+            substrate.websocket.connect(url)
+        else:
+            substrate = SubstrateInterface(
+                    url=url,
+                    ss58_format=ss58_format,
+                    type_registry_preset=type_registry_preset,
+                )
+            substrate.update_type_registry_presets()
+            substrate_pool[pool_key] = substrate
 
-    while True:
-        for url in urls:
-            if url in undesirable_urls and not tried_all:
-                logger.info(f"Skipping undesirable url: {url}")
-                continue
-
-            try:
-                if recovering:
-                    substrate.websocket.close()
-                    substrate.websocket.connect(url)
-                else:
-                    substrate = SubstrateInterface(
-                            url=url,
-                            ss58_format=ss58_format,
-                            type_registry_preset=type_registry_preset,
-                        )
-                    substrate.update_type_registry_presets()
-
-            except (
-                ConnectionRefusedError,
-                InvalidStatusCode,
-                ValueError,
-                WebSocketAddressException,
-            ) as exc:
-                logger.warning(f"[substrateinterface] Failed to connect to {url}: {exc}")
-                if isinstance(exc.args[0], str) and exc.args[0].find("Unsupported type registry preset") != -1:
-                    raise ValueError(exc.args[0])
-
-            else:
-                logger.info(f"[substrateinterface] The connection was made at the address: {url}")
-
-                return substrate
-
-        tried_all = True
-
-        logger.error("[substrateinterface] Failed to connect to any node")
-        logger.info(f"Timeout: {timeout} seconds")
-        time.sleep(timeout)
+    except (
+        ConnectionRefusedError,
+        InvalidStatusCode,
+        ValueError,
+        WebSocketAddressException,
+    ) as exc:
+        logger.warning("[substrateinterface] Failed to connect to %s: %s", url, exc)
+        if exc.args and isinstance(exc.args[0], str) and UNSUPPORTED_TYPE_REGISTRY_PRESET in exc.args[0]:
+            raise ValueError(exc.args[0])
 
+    else:
+        logger.info("[substrateinterface] The connection was made at the address: %s", url)
 
-def is_invalid_urls(urls: [str]) -> bool:
-    """Check if invalid urls are in the list"""
-    for url in urls:
-        parsed_url = urllib.parse.urlparse(url)
-        try:
-            assert parsed_url.scheme in ("ws", "wss")
-            assert parsed_url.params == ""
-            assert parsed_url.fragment == ""
-            assert parsed_url.hostname is not None
-        except AssertionError:
+        return substrate
+
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_node_address(url: str) -> (str, int):
+    """Get the host and the port of the node from the url, or None if the url is invalid"""
+    match = WS_URL_PATTERN.match(url)
+    if match is None:
+        return None
+
+    host = match.group('host').strip('[]').lower()
+    port = int(match.group('port') or DEFAULT_PORTS[match.group('scheme').lower()])
+
+    return host, port
+
+
+def is_reachable(url: str, timeout: float = REACHABILITY_TIMEOUT) -> bool:
+    """Check if the node accepts TCP connections before making a websocket handshake"""
+    address = get_node_address(url)
+    if address is None:
+        return False
+
+    try:
+        with socket.create_connection(address, timeout=timeout):
             return True
+    except (OSError, OverflowError, ValueError):
+        return False
 
-    return False
+
+def is_invalid_urls(urls: [str]) -> bool:
+    """Check if invalid urls are in the list"""
+    return any(WS_URL_PATTERN.match(url) is None for url in urls)
 
 
 def get_abi(abi_path: str) -> list:
-    """Get ABI from file"""
-    with open(abi_path, 'r') as f:
-        return json.load(f)
+    """Get ABI from file. The file is parsed again only if it has been modified"""
+    return _read_abi(abi_path, os.stat(abi_path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_abi(abi_path: str, mtime_ns: int) -> list:
+    """Read and parse the ABI file. The modification time is a part of the cache key"""
+    with open(abi_path, 'rb') as f:
+        return json_loads(f.read())
 
 
 def get_private_key(private_key_path: str, private_key: str) -> str:
@@ -205,7 +336,7 @@ def get_private_key(private_key_path: str, private_key: str) -> str:
             Web3().eth.account.from_key(pk)
             return pk
     except Exception as exc:
-        logger.info(f"Failed to parse the private key from file: {exc}")
+        logger.info("Failed to parse the private key from file: %s", exc)
         return private_key
 
 
@@ -216,12 +347,28 @@ def check_contract_address(w3: Web3, contract_addr: str):
         raise ValueError("Incorrect contract address or the contract is not deployed")
 
 
-def check_abi(w3: Web3, contract_addr: ChecksumAddress, abi: list):
-    """Check the provided ABI by checking JSON file and calling the contract methods"""
+def get_function_selectors(abi: list) -> dict:
+    """Get the 4-byte selectors of the contract functions by their names"""
+    return {elem['name']: function_abi_to_4byte_selector(elem) for elem in abi if elem.get('type') == 'function'}
+
+
+def check_abi(abi: list, w3: Web3 = None, contract_addr: ChecksumAddress = None):
+    """
+    Check the provided ABI by looking for the functions the oracle relies on.
+    If the contract address is provided, also check the ABI by calling the contract methods.
+    """
+    selectors = get_function_selectors(abi)
+    if 'reportRelay' not in selectors:
+        raise ABIFunctionNotFound("The contract does not contain the 'reportRelay' function")
+
+    if 'getStashAccounts' not in selectors:
+        raise ABIFunctionNotFound("The contract does not contain the 'getStashAccounts' function")
+
+    if w3 is None or contract_addr is None:
+        return
+
     contract = w3.eth.contract(address=contract_addr, abi=abi)
     try:
-        if not hasattr(contract.functions, 'reportRelay'):
-            raise ABIFunctionNotFound("The contract does not contain the 'reportRelay' function")
         contract.functions.reportRelay(0, {
             'stashAccount': bytearray(32),
             'controllerAccount': bytearray(32),
@@ -233,10 +380,6 @@ def check_abi(w3: Web3, contract_addr: ChecksumAddress, abi: list):
             'stashBalance': 0,
             'slashingSpans': 0,
         }).call()
-
-        if not hasattr(contract.functions, 'getStashAccounts'):
-            raise ABIFunctionNotFound("The contract does not contain the 'getStashAccounts' function")
-
         contract.functions.getStashAccounts().call()
 
     except ValueError:
@@ -255,14 +398,7 @@ def check_abi_path(abi_path: str):
         raise FileNotFoundError(f"The file with the ABI was not found: {abi_path}")
 
 
+@functools.lru_cache(maxsize=128)
 def get_parachain_address(_para_id: int) -> str:
     """Get parachain address using parachain id with ss58 format provided"""
-    prefix = b'para'
-    para_addr = bytearray(prefix)
-    para_addr.append(_para_id & 0xFF)
-    _para_id = _para_id >> 8
-    para_addr.append(_para_id & 0xFF)
-    _para_id = _para_id >> 8
-    para_addr.append(_para_id & 0xFF)
-
-    return para_addr.ljust(32, b'\0').hex()
+    return (b'para' + (_para_id & 0xFFFFFF).to_bytes(3, 'little')).ljust(32, b'\0').hex()
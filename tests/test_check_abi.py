@@ -0,0 +1,18 @@
+import pytest
+from oracleservice.utils import check_abi, get_abi
+from web3.exceptions import ABIFunctionNotFound
+
+
+ABI_PATH = 'assets/oracle.json'
+
+
+def test_oracle_abi_passes():
+    check_abi(get_abi(ABI_PATH))
+
+
+@pytest.mark.parametrize('function_name', ['reportRelay', 'getStashAccounts'])
+def test_abi_without_function_raises(function_name):
+    abi = [elem for elem in get_abi(ABI_PATH) if elem.get('name') != function_name]
+
+    with pytest.raises(ABIFunctionNotFound, match=function_name):
+        check_abi(abi)
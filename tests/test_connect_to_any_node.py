@@ -0,0 +1,66 @@
+import pytest
+from oracleservice import utils
+from oracleservice.utils import BACKOFF_BASE_DELAY, connect_to_any_node
+
+
+class FakeConnect:
+    def __init__(self, succeed_on: int = None):
+        self.urls = []
+        self.succeed_on = succeed_on
+
+    def __call__(self, url: str):
+        self.urls.append(url)
+        if len(self.urls) == self.succeed_on:
+            return url
+
+        return None
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    delays = []
+    monkeypatch.setattr(utils.time, 'sleep', delays.append)
+
+    return delays
+
+
+def test_undesirable_urls_are_tried_last(delays):
+    connect = FakeConnect(succeed_on=4)
+
+    connection = connect_to_any_node(connect, 'test', ('a', 'b', 'c'), undesirable_urls=frozenset({'a'}))
+
+    assert connection == 'b'
+    assert connect.urls == ['b', 'c', 'a', 'b']
+    assert len(delays) == 1
+
+
+def test_undesirable_urls_are_tried_in_the_first_round(delays):
+    connect = FakeConnect(succeed_on=2)
+
+    connection = connect_to_any_node(connect, 'test', ('a', 'b'), undesirable_urls=frozenset({'a', 'b'}))
+
+    assert connection == 'b'
+    assert delays == []
+
+
+@pytest.mark.parametrize('bound', [0, 1])
+def test_delays_are_capped_by_timeout(monkeypatch, delays, bound):
+    monkeypatch.setattr(utils.random, 'uniform', lambda a, b: (a, b)[bound])
+    timeout = 5
+
+    with pytest.raises(ConnectionError):
+        connect_to_any_node(FakeConnect(), 'test', ('a',), timeout=timeout, max_retries=20)
+
+    assert len(delays) == 19
+    assert all(BACKOFF_BASE_DELAY <= delay <= timeout for delay in delays)
+    assert delays[-1] == (BACKOFF_BASE_DELAY, timeout)[bound]
+
+
+def test_max_retries_raises(delays):
+    connect = FakeConnect()
+
+    with pytest.raises(ConnectionError):
+        connect_to_any_node(connect, 'test', ('a', 'b'), max_retries=3)
+
+    assert connect.urls == ['a', 'b'] * 3
+    assert len(delays) == 2
@@ -0,0 +1,153 @@
+import functools
+import pytest
+from oracleservice.report_parameters_reader import ReportParametersReader, STASH_STORAGE_FUNCTIONS
+from scalecodec.base import RuntimeConfigurationObject
+from scalecodec.type_registry import load_type_registry_preset
+from substrateinterface import Keypair, SubstrateInterface
+from types import SimpleNamespace
+
+
+BLOCK_HASH = '0x' + 'ab' * 32
+CONTROLLER = '0x' + '11' * 32
+FREE_BALANCE = 10 ** 12
+ACCOUNT_INFO = '0x' + (bytes(16) + FREE_BALANCE.to_bytes(16, 'little') + bytes(48)).hex()
+NOMINATIONS = '0x04' + '22' * 32 + '01000000' + '00'
+
+ALICE = '0xd43593c715fdd31c61141abd04a99fd6822c8558854ccde39a5684e7a56da27d'
+ALICE_ACCOUNT_KEY = (
+    '0x26aa394eea5630e07c48ae0c9558cef7b99d880ec681799c0cf30e8886371da9'
+    'de1e86a9a8c739864cf3cc5ec2bea59f'
+    'd43593c715fdd31c61141abd04a99fd6822c8558854ccde39a5684e7a56da27d'
+)
+ALICE_BONDED_KEY = (
+    '0x5f3e4907f716ac89b6347d15ececedca3ed14b45ed20d054f05e37e2542cfe70'
+    '518366b5b1bc7c99'
+    'd43593c715fdd31c61141abd04a99fd6822c8558854ccde39a5684e7a56da27d'
+)
+
+STORAGE_FUNCTIONS = {
+    ('System', 'Account'): ('AccountInfo<Index, AccountData>', 'Default', '0x' + '00' * 80, 'Blake2_128Concat'),
+    ('Staking', 'Bonded'): ('AccountId', 'Optional', '0x00', 'Twox64Concat'),
+    ('Staking', 'Nominators'): ('Nominations', 'Optional', '0x00', 'Twox64Concat'),
+}
+
+
+def get_metadata_storage_function(module: str, storage_function: str, block_hash: str = None):
+    value_type, modifier, default, hasher = STORAGE_FUNCTIONS[(module, storage_function)]
+    return SimpleNamespace(
+        get_param_hashers=lambda: [hasher],
+        get_value_type_string=lambda: value_type,
+        value={'modifier': modifier},
+        value_object={'default': SimpleNamespace(value_object=default)},
+    )
+
+
+def query(module: str, storage_function: str, block_hash: str = None, **kwargs):
+    assert (module, storage_function) == ('Session', 'Validators'), f"{module}.{storage_function} is not prefetched"
+    return SimpleNamespace(value=[])
+
+
+@pytest.fixture
+def reader():
+    runtime_config = RuntimeConfigurationObject()
+    runtime_config.update_type_registry(load_type_registry_preset('legacy'))
+    runtime_config.update_type_registry(load_type_registry_preset('kusama'))
+    substrate = SimpleNamespace(
+        generate_storage_hash=functools.partial(SubstrateInterface.generate_storage_hash, None),
+        get_metadata_module=lambda module, block_hash=None: SimpleNamespace(value={'storage': {'prefix': module}}),
+        get_metadata_storage_function=get_metadata_storage_function,
+        metadata=None,
+        query=query,
+        runtime_config=runtime_config,
+    )
+
+    return ReportParametersReader(service_params=SimpleNamespace(substrate=substrate))
+
+
+@pytest.fixture
+def stash():
+    return Keypair(public_key=ALICE, ss58_format=2)
+
+
+def prefetch(reader: ReportParametersReader, stash: Keypair, values: dict, absent_as_null: bool) -> list:
+    """Prefetch the stash storage with a fake state_queryStorageAt response containing the given values"""
+    requests = []
+
+    def rpc_request(method: str, params: list) -> dict:
+        requests.append((method, params))
+        changes = [
+            [storage_key, values.get(storage_function)]
+            for (_, storage_function), storage_key in zip(STASH_STORAGE_FUNCTIONS, params[0])
+            if absent_as_null or storage_function in values
+        ]
+        # The node does not have to return the changes in the order of the requested keys
+        changes.reverse()
+
+        return {'result': [{'block': BLOCK_HASH, 'changes': changes}]}
+
+    reader.service_params.substrate.rpc_request = rpc_request
+    reader._prefetch_by_account(STASH_STORAGE_FUNCTIONS, stash, BLOCK_HASH)
+
+    return requests
+
+
+def test_storage_keys_are_pinned(reader, stash):
+    assert reader._get_storage_key('System', 'Account', stash, None) == ALICE_ACCOUNT_KEY
+    assert reader._get_storage_key('Staking', 'Bonded', stash, None) == ALICE_BONDED_KEY
+
+
+@pytest.mark.parametrize('module, storage_function', STASH_STORAGE_FUNCTIONS)
+def test_storage_keys_match_query_encoding(reader, stash, module, storage_function):
+    substrate = reader.service_params.substrate
+    account_id = substrate.runtime_config.create_scale_object('AccountId').encode(ALICE)
+    hashers = get_metadata_storage_function(module, storage_function).get_param_hashers()
+
+    expected_key = substrate.generate_storage_hash(module, storage_function, [account_id], hashers)
+
+    assert reader._get_storage_key(module, storage_function, stash, None) == expected_key
+
+
+@pytest.mark.parametrize('absent_as_null', [False, True])
+def test_prefetch_without_nominations(reader, stash, absent_as_null):
+    requests = prefetch(reader, stash, {'Account': ACCOUNT_INFO, 'Bonded': CONTROLLER}, absent_as_null)
+
+    assert len(requests) == 1
+    method, (storage_keys, block_hash) = requests[0]
+    assert method == 'state_queryStorageAt'
+    assert storage_keys[:2] == [ALICE_ACCOUNT_KEY, ALICE_BONDED_KEY]
+    assert block_hash == BLOCK_HASH
+
+    assert reader._get_stash_free_balance(stash, BLOCK_HASH) == FREE_BALANCE
+    assert reader._query_by_account('Staking', 'Bonded', stash, BLOCK_HASH).value == CONTROLLER
+    assert reader._get_stake_status(stash, BLOCK_HASH) == 0
+    assert reader.prefetched_values == {}
+
+
+@pytest.mark.parametrize('absent_as_null', [False, True])
+def test_prefetch_without_account_and_controller(reader, stash, absent_as_null):
+    prefetch(reader, stash, {'Nominators': NOMINATIONS}, absent_as_null)
+
+    assert reader._get_stash_free_balance(stash, BLOCK_HASH) == 0
+    assert reader._get_stake_status(stash, BLOCK_HASH) == 1
+    assert reader._get_ledger_data(BLOCK_HASH, stash) is None
+    assert reader.prefetched_values == {}
+
+
+def test_decode_present_value(reader):
+    controller = reader._decode_storage_value('Staking', 'Bonded', CONTROLLER, None)
+    assert controller.value == CONTROLLER
+
+    account_info = reader._decode_storage_value('System', 'Account', ACCOUNT_INFO, None)
+    assert account_info.value['data']['free'] == FREE_BALANCE
+
+
+def test_decode_absent_value_with_default_modifier(reader):
+    account_info = reader._decode_storage_value('System', 'Account', None, None)
+    assert account_info.value['nonce'] == 0
+    assert account_info.value['data']['free'] == 0
+
+
+@pytest.mark.parametrize('storage_function', ['Bonded', 'Nominators'])
+def test_decode_absent_value_with_optional_modifier(reader, storage_function):
+    value = reader._decode_storage_value('Staking', storage_function, None, None)
+    assert value.value is None
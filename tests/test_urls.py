@@ -0,0 +1,33 @@
+import pytest
+from oracleservice.utils import get_node_address, is_invalid_urls
+
+
+NODE_ADDRESSES = (
+    ('ws://h', ('h', 80)),
+    ('wss://h', ('h', 443)),
+    ('wss://h:9944/p?k=1', ('h', 9944)),
+    ('ws://[::1]:80', ('::1', 80)),
+    ('ws://u:p@h:1', ('h', 1)),
+    ('ws://u@[::1]', ('::1', 80)),
+    ('ws://h/p;x', ('h', 80)),
+    ('WS://H', ('h', 80)),
+    ('ws://h:', ('h', 80)),
+    ('ws://h?x#', ('h', 80)),
+    ('ws://h#f', None),
+    ('ws://h/p?a#b', None),
+    ('http://h', None),
+    ('ws://', None),
+    ('ws://h:abc', None),
+    ('ws://h;x', None),
+    ('ws:// h', None),
+)
+
+
+@pytest.mark.parametrize('url, address', NODE_ADDRESSES)
+def test_get_node_address(url, address):
+    assert get_node_address(url) == address
+
+
+@pytest.mark.parametrize('url, address', NODE_ADDRESSES)
+def test_is_invalid_urls(url, address):
+    assert is_invalid_urls([url]) == (address is None)